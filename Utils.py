@@ -1,22 +1,13 @@
 # Import necessary libraries
+# Heavy third party libraries (pandas, PIL, dateutil, selenium) are imported within
+# the functions that need them, so that importing this module stays cheap
 import csv
 import os
-import pandas as pd
 import re
 import time
-from dateutil.relativedelta import relativedelta
-from datetime import datetime
-from io import BytesIO
-from PIL import Image
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
-from selenium.webdriver.support.wait import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 
 # Declaring variables
-chromedriverfilepath = r'.\chromedriver.exe'   # Need to always check that the chromedriver version is compatible with the computer chrome version, https://googlechromelabs.github.io/chrome-for-testing/
+chromedriverfilepath = os.path.join('.', 'chromedriver.exe')   # Need to always check that the chromedriver version is compatible with the computer chrome version, https://googlechromelabs.github.io/chrome-for-testing/
 
 # Custom exception handling class
 class MyError(Exception):
@@ -49,9 +40,13 @@ def initialise_driver(chromedriverfilepath, headlessflg=False):
     driver (object) : webdriver
     """
     if os.path.exists(chromedriverfilepath):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
         # Tune setup options
         options = Options()
-        options.headless = headlessflg  # Decides whether headless mode or not
+        # Decides whether headless mode or not. The options.headless setter was removed in Selenium 4.10
+        if headlessflg:
+            options.add_argument("--headless=new")
         # options.add_argument("--window-size=1920,1080")  # Define the window size of the browser 1920x1080 px
         options.add_argument("--start-maximized")  # maximise the browser window
         cService = webdriver.ChromeService(executable_path=chromedriverfilepath)
@@ -61,6 +56,28 @@ def initialise_driver(chromedriverfilepath, headlessflg=False):
         raise MyError("Unable to locate Chrome Webdriver filepath")
 
 
+def init_csv(filepath, fieldnames):
+    """
+    This function creates a csv file with the given field names as its header row,
+    if the file has yet to exist. Existing files are left untouched.
+
+    Args:
+    ----------
+    filepath (str) : filepath of the csv file to initialise
+    fieldnames (list) : field names to write as the header row
+
+    Returns
+    -------
+    None
+
+    """
+    if not os.path.exists(filepath):
+        # setting newline parameter to '' so that no unnecessary newline is created by csv writer
+        with open(filepath, 'w', newline='') as f:
+            csv_write = csv.writer(f)
+            csv_write.writerow(fieldnames)
+
+
 def scroll_to_bottom(element, driver):
     """
     Given a scrollable Selenium element and Selenium Chrome Webdriver,
@@ -106,6 +123,8 @@ def datediff(scrapedate, durdiff):
     datetime object converted to date string 
 
     """
+    from dateutil.relativedelta import relativedelta
+
     if durdiff == '':
         # Essentially set the review contribution date as the date of scraping
         contributiondate = scrapedate - relativedelta()
@@ -146,6 +165,7 @@ def read_ID(reviewfilepath, target=[], idx=''):
     """
     # Read in list of google contributor IDs
     if os.path.exists(reviewfilepath):
+        import pandas as pd
         df = pd.read_csv(reviewfilepath)
         if set(['Reviewer_ID', 'BusinessName']).issubset(df.columns):
             # If target businesses specified
@@ -183,6 +203,9 @@ def scroll_screenshot(element, driver, imagefilepath, stitchflg=True):
     None.
 
     """
+    from io import BytesIO
+    from PIL import Image
+
     slices = []  # to store image fragment
     offset = 0  # where to start
     # create the folder to store images, if it does not yet exist
@@ -206,7 +229,7 @@ def scroll_screenshot(element, driver, imagefilepath, stitchflg=True):
         # Appending each screenshot to a list, for stitching if activated
         slices.append(img)
         # Take screenshot image of visible real estate and store as png format
-        element.screenshot(imagefilepath + f'\screen_{offset}.png')
+        element.screenshot(os.path.join(imagefilepath, f'screen_{offset}.png'))
         print (offset, finalscrollht)
     print('Screenshots of all reviews taken.')
 
@@ -232,6 +255,40 @@ def scroll_screenshot(element, driver, imagefilepath, stitchflg=True):
         for img_frag in slices:
             img_frame.paste(img_frag, (0, offset))
             offset += img_frag.size[1]
-        img_frame.save(imagefilepath + '\stitchedimage.png')
+        img_frame.save(os.path.join(imagefilepath, 'stitchedimage.png'))
 
         print('Screenshots of all reviews stitched into one long image.')
+
+
+def dedupe_csv(filepath, ignore=['ScrapedDate']):
+    """
+    This function removes duplicated rows from a scraped csv file, e.g. rows
+    appended again when a business entity or reviewer is re-scraped. Rows are
+    compared on all fields except those to ignore, and the last occurrence is kept,
+    so that the remaining rows carry the latest ScrapedDate.
+
+    Args:
+    ----------
+    filepath (str) : filepath of the csv file to deduplicate
+    ignore (list) : field names to ignore when comparing rows. The default is ['ScrapedDate'].
+
+    Raises
+    ------
+    MyError (str): Inform user that the file cannot be located
+
+    Returns
+    -------
+    numdropped (int) : number of duplicated rows removed
+
+    """
+    if os.path.exists(filepath):
+        import pandas as pd
+        df = pd.read_csv(filepath, dtype=str, keep_default_na=False)
+        subset = [col for col in df.columns if col not in ignore]
+        deduped = df.drop_duplicates(subset=subset, keep='last')
+        numdropped = len(df) - len(deduped)
+        if numdropped > 0:
+            deduped.to_csv(filepath, index=False, encoding='utf-8')
+        return numdropped
+    else:
+        raise MyError("File not available, please check.")
@@ -0,0 +1,455 @@
+# Import necessary libraries
+import hashlib
+import os
+import numpy as np
+import pandas as pd
+import Utils
+
+# Declaring variables
+# Filepath for file containing google contributors and their contribution summary.
+contrisumfilepath = os.path.join(".", "contributorsummary.csv")
+# Filepath for file containing google contributors and their detailed contributions.
+contridetailfilepath = os.path.join(".", "contributordetails.csv")
+# Folder for cached arrays and analytics results. Set to None to disable caching.
+cachedir = os.path.join(".", "analyticscache")
+# Contribution count field names in the contribution summary file
+contricountcols = ["Reviews", "Ratings", "Photos", "Videos", "Captions", "Answers",
+                   "Edits", "Reported", "Places", "Roads", "Facts", "Q&A"]
+# Sentinel for missing dates, stored as days since 1970-01-01
+NODATE = -1
+# Number of reviewers processed at a time when building overlap matrices
+overlapchunk = 65536
+
+
+def _signature(*filepaths):
+    """
+    This function returns the size and modification time of the source files, which
+    is stored alongside cached arrays so that the cache is invalidated when the
+    source files change.
+    """
+    sig = []
+    for filepath in filepaths:
+        if not os.path.exists(filepath):
+            raise Utils.MyError(f"File {filepath} not available, please check.")
+        st = os.stat(filepath)
+        sig += [st.st_size, st.st_mtime_ns]
+    return np.array(sig, dtype=np.int64)
+
+
+def _cache_path(cachedir, name, params):
+    """This function returns the cache filepath for the given cache entry name and parameters."""
+    key = hashlib.sha1(repr(params).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(cachedir, f"{name}-{key}.npz")
+
+
+def _cache_load(cachedir, name, params, signature):
+    """
+    This function reads in the cached arrays for the given cache entry, returning
+    None if caching is disabled, the entry does not exist or the source files have
+    changed since the entry was written.
+    """
+    if cachedir is None:
+        return None
+    filepath = _cache_path(cachedir, name, params)
+    if not os.path.exists(filepath):
+        return None
+    with np.load(filepath, allow_pickle=False) as npz:
+        arrays = {k: npz[k] for k in npz.files}
+    if not np.array_equal(arrays.pop("__signature__", None), signature):
+        return None
+    return arrays
+
+
+def _cache_save(cachedir, name, params, signature, arrays):
+    """This function writes the arrays of the given cache entry, if caching is enabled."""
+    if cachedir is None:
+        return
+    os.makedirs(cachedir, exist_ok=True)
+    filepath = _cache_path(cachedir, name, params)
+    # Write to a temporary file first so that an interrupted write never leaves a corrupt entry
+    with open(filepath + ".tmp", "wb") as f:
+        np.savez(f, __signature__=signature, **arrays)
+    os.replace(filepath + ".tmp", filepath)
+
+
+def _frame_to_arrays(df):
+    """This function converts a dataframe into arrays that can be cached without pickling."""
+    arrays = {"__indexname__": np.array([df.index.name or ""]),
+              "__columns__": np.array(df.columns, dtype=str)}
+    for key, values in [("__index__", df.index.to_numpy())] + [(f"col{i}", df[col].to_numpy()) for i, col in enumerate(df.columns)]:
+        arrays[key] = values.astype(str) if values.dtype == object else values
+    return arrays
+
+
+def _arrays_to_frame(arrays):
+    """This function converts cached arrays back into the dataframe they were built from."""
+    columns = arrays["__columns__"].tolist()
+    index = pd.Index(arrays["__index__"], name=arrays["__indexname__"][0] or None)
+    return pd.DataFrame({col: arrays[f"col{i}"] for i, col in enumerate(columns)},
+                        index=index, columns=columns)
+
+
+def _cached_frame(name, params, signature, cachedir, compute):
+    """This function returns the cached dataframe for the cache entry, computing and caching it on a miss."""
+    arrays = _cache_load(cachedir, name, params, signature)
+    if arrays is not None:
+        return _arrays_to_frame(arrays)
+    df = compute()
+    _cache_save(cachedir, name, params, signature, _frame_to_arrays(df))
+    return df
+
+
+def _encode(values):
+    """
+    This function categorical-encodes an array of strings, with empty strings
+    encoded as -1.
+
+    Returns
+    -------
+    codes (array) : int32 codes into categories
+    categories (array) : unique non-empty strings, in order of first appearance
+    """
+    codes, categories = pd.factorize(pd.Series(values).replace("", None))
+    return codes.astype(np.int32), np.asarray(categories, dtype=str)
+
+
+def _extract_ID(values):
+    """This function extracts the numeric reviewer IDs from the Reviewer_ID field, e.g. "['123']"."""
+    return pd.Series(values).str.extract(r"(\d+)", expand=False).fillna("").to_numpy()
+
+
+def load_details(contridetailfilepath=contridetailfilepath, cachedir=cachedir):
+    """
+    This function reads in the contribution details file into compact typed arrays,
+    with reviewer IDs, business names and contribution types categorical-encoded and
+    contribution dates stored as integer days since 1970-01-01. Where a reviewer has
+    been scraped more than once, only the rows from the latest ScrapedDate are kept.
+    The arrays are cached on disk and only rebuilt when the contribution details file changes.
+
+    Args:
+    ----------
+    contridetailfilepath (str) : filepath for file containing contributor detailed contributions
+    cachedir (str) : folder for cached arrays. None disables caching.
+
+    Raises
+    ------
+    MyError (str): Refer to the script for the error messages
+
+    Returns
+    -------
+    details (dict) : arrays with keys
+                     reviewer (int32) : reviewer code of each row, indexing into reviewer_ids
+                     reviewer_ids (str) : unique reviewer IDs
+                     business (int32) : business code of each row, indexing into businesses. -1 if none
+                     businesses (str) : unique business names
+                     type (int32) : contribution type code of each row, indexing into types. -1 if none
+                     types (str) : unique contribution types, e.g. Review, Photos
+                     rating (int8) : rating of each row from 1 to 5. 0 if not rated
+                     date (int32) : contribution date of each row in days since 1970-01-01. NODATE if none
+                     signature (int64) : size and modification time of the source file
+                     source (str) : absolute filepath of the source file
+
+    """
+    signature = _signature(contridetailfilepath)
+    params = ("details", os.path.abspath(contridetailfilepath))
+    details = _cache_load(cachedir, "details", params, signature)
+    if details is not None:
+        details["signature"], details["source"] = signature, params[1]
+        return details
+
+    # Only the fields used below are read in, skipping free text such as Reviews and BusinessAddress
+    usecols = ["Reviewer_ID", "ContributionType", "BusinessName", "Ratings", "ContributionDate", "ScrapedDate"]
+    df = pd.read_csv(contridetailfilepath, dtype=str, keep_default_na=False, usecols=lambda col: col in usecols)
+    if not set(usecols).issubset(df.columns):
+        raise Utils.MyError("Reviewer_ID, ContributionType, BusinessName, Ratings, ContributionDate and ScrapedDate field names expected, but cannot be found in contribution details file, please check.")
+
+    # Rows are appended each time a reviewer is scraped, with contribution dates derived from
+    # the scrape date, so only the rows from each reviewer's latest scrape are kept
+    df["Reviewer_ID"] = _extract_ID(df["Reviewer_ID"])
+    scraped = pd.to_datetime(df["ScrapedDate"], format="%d %b %Y", errors="coerce")
+    latest = scraped.groupby(df["Reviewer_ID"]).transform("max")
+    df = df[((scraped == latest) | latest.isna()).to_numpy()].reset_index(drop=True)
+
+    details = {}
+    details["reviewer"], details["reviewer_ids"] = _encode(df["Reviewer_ID"])
+    details["business"], details["businesses"] = _encode(df["BusinessName"])
+    details["type"], details["types"] = _encode(df["ContributionType"])
+    # Ratings are scraped from aria-labels such as ' 5 stars '
+    details["rating"] = (pd.to_numeric(df["Ratings"].str.extract(r"(\d)", expand=False), errors="coerce")
+                         .fillna(0).to_numpy(dtype=np.int8))
+    date = pd.to_datetime(df["ContributionDate"], format="%d %b %Y", errors="coerce")
+    details["date"] = np.where(date.isna(), NODATE,
+                               date.to_numpy().astype("datetime64[D]").astype(np.int64)).astype(np.int32)
+
+    _cache_save(cachedir, "details", params, signature, details)
+    details["signature"], details["source"] = signature, params[1]
+    return details
+
+
+def load_summary(contrisumfilepath=contrisumfilepath, cachedir=cachedir):
+    """
+    This function reads in the contribution summary file into compact typed arrays.
+    Where a reviewer has been scraped more than once, the last scraped row is kept.
+    The arrays are cached on disk and only rebuilt when the contribution summary
+    file changes.
+
+    Args:
+    ----------
+    contrisumfilepath (str) : filepath for file containing contributor contribution summary
+    cachedir (str) : folder for cached arrays. None disables caching.
+
+    Raises
+    ------
+    MyError (str): Refer to the script for the error messages
+
+    Returns
+    -------
+    summary (dict) : arrays with keys
+                     reviewer_ids (str) : unique reviewer IDs
+                     localguide (bool) : whether each reviewer is a local guide
+                     counts (int32) : contribution counts, one row per reviewer and one
+                                      column per field name in contricountcols
+                     signature (int64) : size and modification time of the source file
+                     source (str) : absolute filepath of the source file
+
+    """
+    signature = _signature(contrisumfilepath)
+    params = ("summary", os.path.abspath(contrisumfilepath))
+    summary = _cache_load(cachedir, "summary", params, signature)
+    if summary is not None:
+        summary["signature"], summary["source"] = signature, params[1]
+        return summary
+
+    usecols = ["Reviewer_ID", "Localguide"] + contricountcols
+    df = pd.read_csv(contrisumfilepath, dtype=str, keep_default_na=False, usecols=lambda col: col in usecols)
+    if not set(usecols).issubset(df.columns):
+        raise Utils.MyError("Reviewer_ID, Localguide and contribution count field names expected, but cannot be found in contribution summary file, please check.")
+
+    df["Reviewer_ID"] = _extract_ID(df["Reviewer_ID"])
+    df = df.drop_duplicates(subset="Reviewer_ID", keep="last")
+    # Contribution counts are scraped as text, e.g. '1,234'
+    counts = df[contricountcols].apply(lambda col: pd.to_numeric(col.str.replace(",", ""), errors="coerce"))
+
+    summary = {"reviewer_ids": df["Reviewer_ID"].to_numpy().astype(str),
+               "localguide": (df["Localguide"] == "Yes").to_numpy(),
+               "counts": counts.fillna(0).to_numpy(dtype=np.int32)}
+
+    _cache_save(cachedir, "summary", params, signature, summary)
+    summary["signature"], summary["source"] = signature, params[1]
+    return summary
+
+
+def _review_mask(details):
+    """This function returns the mask of rows that are reviews of a business entity."""
+    types = details["types"].tolist()
+    if "Review" not in types:
+        return np.zeros(len(details["type"]), dtype=bool)
+    return (details["type"] == types.index("Review")) & (details["business"] >= 0) & (details["reviewer"] >= 0)
+
+
+def _group_bounds(keys):
+    """This function returns the start and end (exclusive) positions of each run of equal values in sorted keys."""
+    if len(keys) == 0:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends = np.r_[starts[1:], len(keys)].astype(np.int64)
+    return starts, ends
+
+
+def reviewer_aggregates(details, summary=None, cachedir=cachedir):
+    """
+    This function computes per-reviewer aggregates over the contribution details,
+    such as the number of reviews, the rating distribution and the first and last
+    review dates. If the contribution summary is given, the local guide status and
+    contribution counts of each reviewer are added as well.
+
+    Args:
+    ----------
+    details (dict) : arrays returned by load_details
+    summary (dict) : arrays returned by load_summary. The default is None.
+    cachedir (str) : folder for cached results. None disables caching.
+
+    Returns
+    -------
+    df (dataframe) : one row per reviewer, indexed by Reviewer_ID. Localguide is 1, 0, or -1
+                     and the contribution counts are -1 if the reviewer is not in the summary
+
+    """
+    signature = details["signature"] if summary is None else np.r_[details["signature"], summary["signature"]]
+
+    def compute():
+        nreviewer = len(details["reviewer_ids"])
+        reviewer, rating, date = details["reviewer"], details["rating"], details["date"]
+        review = _review_mask(details)
+
+        # Count reviews, photos and ratings per reviewer
+        out = {"Reviews": np.bincount(reviewer[review], minlength=nreviewer)}
+        types = details["types"].tolist()
+        photos = details["type"] == types.index("Photos") if "Photos" in types else np.zeros(len(reviewer), dtype=bool)
+        out["Photos"] = np.bincount(reviewer[photos & (details["business"] >= 0) & (reviewer >= 0)],
+                                    minlength=nreviewer)
+        ratingcounts = np.bincount(reviewer[review].astype(np.int64) * 6 + rating[review],
+                                   minlength=nreviewer * 6).reshape(nreviewer, 6)[:, 1:]
+        for star in range(1, 6):
+            out[f"Rating{star}"] = ratingcounts[:, star - 1]
+        rated = ratingcounts.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out["MeanRating"] = (ratingcounts * np.arange(1, 6)).sum(axis=1) / rated
+
+        # Count distinct businesses reviewed per reviewer
+        pairs = np.unique(reviewer[review].astype(np.int64) * len(details["businesses"]) + details["business"][review])
+        out["Businesses"] = np.bincount(pairs // max(len(details["businesses"]), 1), minlength=nreviewer)
+
+        # First and last review dates per reviewer, from reviews sorted by reviewer then date
+        dated = review & (date != NODATE)
+        order = np.lexsort((date[dated], reviewer[dated]))
+        r, d = reviewer[dated][order], date[dated][order]
+        starts, ends = _group_bounds(r)
+        first = np.full(nreviewer, NODATE, dtype=np.int64)
+        last = np.full(nreviewer, NODATE, dtype=np.int64)
+        first[r[starts]] = d[starts]
+        last[r[ends - 1]] = d[ends - 1]
+        out["FirstReview"] = np.where(first == NODATE, np.datetime64("NaT"), first.astype("datetime64[D]"))
+        out["LastReview"] = np.where(last == NODATE, np.datetime64("NaT"), last.astype("datetime64[D]"))
+
+        if summary is not None:
+            # Align the summary rows to the reviewer codes, -1 where the reviewer is not in the summary
+            idx = pd.Index(summary["reviewer_ids"]).get_indexer(details["reviewer_ids"])
+            found = idx >= 0
+            out["Localguide"] = np.full(nreviewer, -1, dtype=np.int8)
+            out["Localguide"][found] = summary["localguide"][idx[found]]
+            for i, col in enumerate(contricountcols):
+                out[f"Summary{col}"] = np.full(nreviewer, -1, dtype=np.int32)
+                out[f"Summary{col}"][found] = summary["counts"][idx[found], i]
+
+        return pd.DataFrame(out, index=pd.Index(details["reviewer_ids"], name="Reviewer_ID"))
+
+    params = ("aggregates", details["source"], None if summary is None else summary["source"])
+    return _cached_frame("aggregates", params, signature, cachedir, compute)
+
+
+def review_bursts(details, window=7, threshold=5, cachedir=cachedir):
+    """
+    This function detects review bursts, i.e. periods in which a reviewer posts at
+    least threshold reviews within window days of each other, based on ContributionDate.
+    Overlapping windows of the same reviewer are merged into one burst. Note that
+    contribution dates are derived from relative dates such as 'a month ago', so
+    older reviews are grouped onto the same date more coarsely.
+
+    Args:
+    ----------
+    details (dict) : arrays returned by load_details
+    window (int) : length of the sliding window in days. The default is 7.
+    threshold (int) : minimum number of reviews within the window. The default is 5.
+    cachedir (str) : folder for cached results. None disables caching.
+
+    Raises
+    ------
+    MyError (str): Inform user that window and threshold must be positive
+
+    Returns
+    -------
+    df (dataframe) : one row per burst with Reviewer_ID, StartDate, EndDate and Reviews
+
+    """
+    if window < 1 or threshold < 1:
+        raise Utils.MyError("window and threshold must be positive integers.")
+
+    def compute():
+        review = _review_mask(details) & (details["date"] != NODATE)
+        reviewer, date = details["reviewer"][review], details["date"][review]
+
+        # Sort by reviewer then date, packed into one int64 key per review. As dates are
+        # non-negative and well below 2**32, subtracting the window from a key never
+        # reaches back into the reviews of the previous reviewer
+        keys = np.sort((reviewer.astype(np.int64) << 32) | date.astype(np.int64))
+        # For each review, the position of the earliest review of the same reviewer within the window
+        windowstart = np.searchsorted(keys, keys - (window - 1), side="left")
+        pos = np.arange(len(keys))
+        hit = pos - windowstart + 1 >= threshold
+
+        # Merge overlapping windows of the same reviewer into one burst
+        hitstart, hitend = windowstart[hit], pos[hit]
+        newburst = np.r_[True, hitstart[1:] > hitend[:-1]] if len(hitend) else np.array([], dtype=bool)
+        burststart = hitstart[newburst]
+        burstend = np.r_[hitend[np.flatnonzero(newburst)[1:] - 1], hitend[-1:]]
+
+        return pd.DataFrame({
+            "Reviewer_ID": details["reviewer_ids"][keys[burststart] >> 32],
+            "StartDate": (keys[burststart] & 0xFFFFFFFF).astype("datetime64[D]"),
+            "EndDate": (keys[burstend] & 0xFFFFFFFF).astype("datetime64[D]"),
+            "Reviews": burstend - burststart + 1,
+        })
+
+    params = ("bursts", details["source"], window, threshold)
+    return _cached_frame("bursts", params, details["signature"], cachedir, compute)
+
+
+def business_overlap(details, businesses=[], top=50, cachedir=cachedir):
+    """
+    This function computes the reviewer-overlap matrix between business entities,
+    i.e. the number of distinct reviewers who reviewed both business entities. The
+    diagonal holds the number of distinct reviewers of each business entity.
+
+    Args:
+    ----------
+    details (dict) : arrays returned by load_details
+    businesses (list) : business entities to include, repeats ignored. The default is [], in which
+                        case the top business entities by number of distinct reviewers are used.
+    top (int) : number of business entities to include when businesses is not specified. The default is 50.
+    cachedir (str) : folder for cached results. None disables caching.
+
+    Raises
+    ------
+    MyError (str): Inform user that top is not positive or at least one business entity cannot be found
+
+    Returns
+    -------
+    df (dataframe) : square matrix of shared reviewer counts, indexed by business name on both axes
+
+    """
+    if top < 1:
+        raise Utils.MyError("top must be a positive integer.")
+    # Repeated business entities would share one matrix position, so keep the first of each
+    businesses = list(dict.fromkeys(businesses))
+    if len(businesses) > 0:
+        selected = pd.Index(details["businesses"]).get_indexer(businesses)
+        if (selected < 0).any():
+            missing = [biz for biz, ix in zip(businesses, selected) if ix < 0]
+            raise Utils.MyError(f"Business entities {missing} cannot be found in contribution details file, please check.")
+
+    def compute():
+        nbusiness = len(details["businesses"])
+        review = _review_mask(details)
+        # Distinct (reviewer, business) pairs, sorted by reviewer
+        pairs = np.unique(details["reviewer"][review].astype(np.int64) * nbusiness + details["business"][review])
+        pairreviewer, pairbusiness = pairs // max(nbusiness, 1), pairs % max(nbusiness, 1)
+
+        if len(businesses) > 0:
+            chosen = selected
+        else:
+            # Business entities with the most distinct reviewers, ties broken by order of first appearance
+            reviewers = np.bincount(pairbusiness, minlength=nbusiness)
+            chosen = np.argsort(-reviewers, kind="stable")[:top]
+
+        # Map selected business codes to matrix positions, -1 for business entities not selected
+        lookup = np.full(nbusiness, -1, dtype=np.int64)
+        lookup[chosen] = np.arange(len(chosen))
+        keep = lookup[pairbusiness] >= 0
+        r, b = pairreviewer[keep], lookup[pairbusiness[keep]]
+        _, r = np.unique(r, return_inverse=True)
+
+        # Accumulate B.T @ B over chunks of reviewers, B being the reviewer-by-business incidence matrix
+        matrix = np.zeros((len(chosen), len(chosen)), dtype=np.float64)
+        bounds = np.searchsorted(r, np.arange(0, r.max() + 1 if len(r) else 0, overlapchunk))
+        for lo, hi in zip(bounds, np.r_[bounds[1:], len(r)]):
+            incidence = np.zeros((r[hi - 1] - r[lo] + 1, len(chosen)), dtype=np.float32)
+            incidence[r[lo:hi] - r[lo], b[lo:hi]] = 1
+            matrix += incidence.T @ incidence
+
+        names = details["businesses"][chosen]
+        return pd.DataFrame(np.rint(matrix).astype(np.int64),
+                            index=pd.Index(names, name="BusinessName"), columns=names)
+
+    params = ("overlap", details["source"], tuple(businesses), top)
+    return _cached_frame("overlap", params, details["signature"], cachedir, compute)
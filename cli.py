@@ -0,0 +1,218 @@
+# Import necessary libraries
+# Only lightweight modules are imported here. The scraping and analytics modules (and through
+# them selenium, pandas, numpy, PIL and dateutil) are imported within the subcommand that needs them,
+# so that startup stays fast, e.g. for `--help` or maintenance jobs.
+import argparse
+import os
+import sys
+import Utils
+
+
+def run_reviews(args):
+    """Scrape the summary information and google reviews of a business entity."""
+    import review
+    biz = args.business or input('Please input the business name you want reviews to be scraped from : \n ')
+    review.scrape_reviews(biz,
+                          bizsummaryfilepath=args.summary_file,
+                          bizreviewfilepath=args.review_file,
+                          imagefilepath=args.image_dir,
+                          chromedriverfilepath=args.chromedriver,
+                          headlessflg=args.headless,
+                          screenshotflg=not args.no_screenshots)
+
+
+def run_contributors(args):
+    """Scrape the contribution summary and details of reviewers in the google reviews file."""
+    import contributor
+    contributor.scrape_contributors(bizreviewfilepath=args.review_file,
+                                    contrisumfilepath=args.summary_file,
+                                    contridetailfilepath=args.detail_file,
+                                    target=args.target,
+                                    idx=args.start_id,
+                                    chromedriverfilepath=args.chromedriver,
+                                    headlessflg=args.headless)
+
+
+def run_screenshots(args):
+    """Take screenshots of the review section of a business entity."""
+    import review
+    review.screenshot_reviews(args.business,
+                              imagefilepath=args.image_dir,
+                              chromedriverfilepath=args.chromedriver,
+                              headlessflg=args.headless,
+                              stitchflg=not args.no_stitch)
+
+
+def run_ids(args):
+    """Print the reviewer IDs that the contributors subcommand would scrape."""
+    IDlist = Utils.read_ID(args.review_file, args.target, args.start_id)
+    for ix in IDlist:
+        print(ix)
+    print(f"{len(IDlist)} reviewer IDs found.", file=sys.stderr)
+
+
+def run_dedupe(args):
+    """Remove duplicated rows from scraped csv files."""
+    for filepath in args.files:
+        if not os.path.exists(filepath):
+            print(f"{filepath}: not found, skipped.")
+            continue
+        numdropped = Utils.dedupe_csv(filepath, ignore=args.ignore if args.ignore is not None else ['ScrapedDate'])
+        print(f"{filepath}: {numdropped} duplicated rows removed.")
+
+
+def run_check_driver(args):
+    """Check that the chromedriver file can be located."""
+    if not os.path.exists(args.chromedriver):
+        raise Utils.MyError("Unable to locate Chrome Webdriver filepath")
+    print(f"Chrome Webdriver found at {args.chromedriver}.")
+
+
+def run_analytics(args):
+    """Run an analysis over the contribution details file and print or save the result."""
+    import analytics
+    cachedir = None if args.no_cache else args.cache_dir
+    details = analytics.load_details(args.detail_file, cachedir=cachedir)
+    if args.analysis == 'reviewers':
+        summary = analytics.load_summary(args.summary_file, cachedir=cachedir) if os.path.exists(args.summary_file) else None
+        df = analytics.reviewer_aggregates(details, summary, cachedir=cachedir)
+    elif args.analysis == 'bursts':
+        df = analytics.review_bursts(details, window=args.window, threshold=args.threshold, cachedir=cachedir)
+    else:
+        df = analytics.business_overlap(details, businesses=args.business, top=args.top, cachedir=cachedir)
+    if args.out:
+        df.to_csv(args.out, encoding='utf-8')
+        print(f"{len(df)} rows written to {args.out}.")
+    else:
+        print(df.to_string())
+
+
+def build_parser():
+    """
+    This function builds the command line parser, with one subcommand per
+    scraping or maintenance job.
+
+    Returns
+    -------
+    parser (object) : argparse.ArgumentParser
+    """
+    # Default filepaths, mirroring the ones declared in review.py and contributor.py
+    bizsummaryfilepath = os.path.join('.', 'entitysummary.csv')
+    bizreviewfilepath = os.path.join('.', 'entityreviews.csv')
+    contrisumfilepath = os.path.join('.', 'contributorsummary.csv')
+    contridetailfilepath = os.path.join('.', 'contributordetails.csv')
+    imagefilepath = os.path.join('.', 'images')
+
+    # Options shared by the subcommands that drive the browser
+    browser = argparse.ArgumentParser(add_help=False)
+    browser.add_argument('--chromedriver', default=Utils.chromedriverfilepath,
+                         help='filepath pointing to the chromedriver file (default: %(default)s)')
+    browser.add_argument('--headless', action='store_true',
+                         help='run the browser in headless mode')
+
+    # Options shared by the subcommands that select reviewer IDs
+    ids = argparse.ArgumentParser(add_help=False)
+    ids.add_argument('--review-file', default=bizreviewfilepath,
+                     help='google reviews file to read reviewer IDs from (default: %(default)s)')
+    ids.add_argument('--target', action='append', default=[], metavar='BUSINESS',
+                     help='only consider reviewers of this business entity, may be repeated')
+    ids.add_argument('--start-id', default='',
+                     help='only consider reviewer IDs from this reviewer ID onwards')
+
+    parser = argparse.ArgumentParser(description='Scrape Google reviews and information about Google reviewers.')
+    subparsers = parser.add_subparsers(dest='command', metavar='command', required=True)
+
+    p = subparsers.add_parser('reviews', parents=[browser], help='scrape the google reviews of a business entity')
+    p.add_argument('business', nargs='?', help='name of the business entity, prompted for if omitted')
+    p.add_argument('--summary-file', default=bizsummaryfilepath,
+                   help='business entity summary file (default: %(default)s)')
+    p.add_argument('--review-file', default=bizreviewfilepath,
+                   help='business entity reviews file (default: %(default)s)')
+    p.add_argument('--image-dir', default=imagefilepath,
+                   help='folder for review screenshot images (default: %(default)s)')
+    p.add_argument('--no-screenshots', action='store_true',
+                   help='skip taking screenshots of the reviews')
+    p.set_defaults(func=run_reviews)
+
+    p = subparsers.add_parser('contributors', parents=[browser, ids],
+                              help='scrape the contributions of reviewers in the google reviews file')
+    p.add_argument('--summary-file', default=contrisumfilepath,
+                   help='contribution summary file (default: %(default)s)')
+    p.add_argument('--detail-file', default=contridetailfilepath,
+                   help='contribution details file (default: %(default)s)')
+    p.set_defaults(func=run_contributors)
+
+    p = subparsers.add_parser('screenshots', parents=[browser],
+                              help='take screenshots of the reviews of a business entity')
+    p.add_argument('business', help='name of the business entity')
+    p.add_argument('--image-dir', default=imagefilepath,
+                   help='folder for review screenshot images (default: %(default)s)')
+    p.add_argument('--no-stitch', action='store_true',
+                   help='do not stitch the screenshots into one long image')
+    p.set_defaults(func=run_screenshots)
+
+    maintenance = subparsers.add_parser('maintenance', help='maintenance jobs on the scraped files')
+    jobs = maintenance.add_subparsers(dest='job', metavar='job', required=True)
+
+    p = jobs.add_parser('ids', parents=[ids], help='list the reviewer IDs to be scraped by the contributors subcommand')
+    p.set_defaults(func=run_ids)
+
+    p = jobs.add_parser('dedupe', help='remove duplicated rows from scraped csv files')
+    p.add_argument('files', nargs='*',
+                   default=[bizsummaryfilepath, bizreviewfilepath, contrisumfilepath, contridetailfilepath],
+                   help='csv files to deduplicate (default: all scraped csv files)')
+    p.add_argument('--ignore', action='append', default=None, metavar='FIELD',
+                   help='field name to ignore when comparing rows, may be repeated, replaces the default (default: ScrapedDate)')
+    p.set_defaults(func=run_dedupe)
+
+    p = jobs.add_parser('check-driver', help='check that the chromedriver file can be located')
+    p.add_argument('--chromedriver', default=Utils.chromedriverfilepath,
+                   help='filepath pointing to the chromedriver file (default: %(default)s)')
+    p.set_defaults(func=run_check_driver)
+
+    # Options shared by the analytics subcommands
+    analysis = argparse.ArgumentParser(add_help=False)
+    analysis.add_argument('--detail-file', default=contridetailfilepath,
+                          help='contribution details file (default: %(default)s)')
+    analysis.add_argument('--cache-dir', default=os.path.join('.', 'analyticscache'),
+                          help='folder for cached arrays and results (default: %(default)s)')
+    analysis.add_argument('--no-cache', action='store_true',
+                          help='neither read nor write cached arrays and results')
+    analysis.add_argument('--out', help='csv file to write the result to, printed if omitted')
+
+    analytics = subparsers.add_parser('analytics', help='analyse the scraped contributor files')
+    analyses = analytics.add_subparsers(dest='analysis', metavar='analysis', required=True)
+
+    p = analyses.add_parser('reviewers', parents=[analysis], help='per-reviewer aggregates')
+    p.add_argument('--summary-file', default=contrisumfilepath,
+                   help='contribution summary file, joined in if it exists (default: %(default)s)')
+    p.set_defaults(func=run_analytics)
+
+    p = analyses.add_parser('bursts', parents=[analysis], help='bursts of reviews posted by the same reviewer')
+    p.add_argument('--window', type=int, default=7, help='length of the sliding window in days (default: %(default)s)')
+    p.add_argument('--threshold', type=int, default=5,
+                   help='minimum number of reviews within the window (default: %(default)s)')
+    p.set_defaults(func=run_analytics)
+
+    p = analyses.add_parser('overlap', parents=[analysis], help='reviewers shared between business entities')
+    p.add_argument('--business', action='append', default=[], metavar='BUSINESS',
+                   help='business entity to include, may be repeated')
+    p.add_argument('--top', type=int, default=50,
+                   help='number of business entities with the most reviewers to include if no --business is given (default: %(default)s)')
+    p.set_defaults(func=run_analytics)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        args.func(args)
+    except Utils.MyError as e:
+        print(f"Error detected: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
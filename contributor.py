@@ -1,26 +1,21 @@
 # Import necessary libraries
 import csv
 import os
-import pandas as pd
-import re
 import time
 import Utils
-from dateutil.relativedelta import relativedelta
 from datetime import datetime
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 # Declaring variables
 # Filepath for file containing google reviews related to business entity.
-bizreviewfilepath = r".\entityreviews.csv"
+bizreviewfilepath = os.path.join(".", "entityreviews.csv")
 # Filepath for file containing google contributors and their contribution summary.
-contrisumfilepath = r".\contributorsummary.csv"
+contrisumfilepath = os.path.join(".", "contributorsummary.csv")
 # Filepath for file containing google contributors and their detailed contributions.
-contridetailfilepath = r".\contributordetails.csv"
+contridetailfilepath = os.path.join(".", "contributordetails.csv")
 # Base url for GoogleMaps Contributor page
 baseurl = "https://google.com/maps/contrib/"
 # Field names for contribution summary file
@@ -58,27 +53,50 @@ target = []
 idx = ""
 
 
-if __name__ == "__main__":
+def scrape_contributors(
+    bizreviewfilepath=bizreviewfilepath,
+    contrisumfilepath=contrisumfilepath,
+    contridetailfilepath=contridetailfilepath,
+    target=target,
+    idx=idx,
+    chromedriverfilepath=Utils.chromedriverfilepath,
+    headlessflg=False,
+):
+    """
+    This function reads in the reviewer IDs from the google reviews file and, for
+    each reviewer, scrapes the contribution summary and detailed contributions
+    (reviews and photos), appending them to the contribution summary and details files.
+
+    Args:
+    ----------
+    bizreviewfilepath (str) : filepath for file containing business entity google reviews
+    contrisumfilepath (str) : filepath for file containing contributor contribution summary
+    contridetailfilepath (str) : filepath for file containing contributor detailed contributions
+    target (list) : list of target business entities to extract reviewer IDs from. The default is [].
+    idx (str) : reviewer ID to subset list of reviewer IDs from. The default is ''.
+    chromedriverfilepath (str) : filepath pointing to the chromedriver.exe file
+    headlessflg (boolean) : whether driver is initialised in headless mode. The default is False.
+
+    Raises
+    ------
+    MyError (str) : Inform user of the error that stopped the scraping
+
+    Returns
+    -------
+    None
+
+    """
+    driver = None
     try:
         # Read in list of google contributor IDs
         IDlist = Utils.read_ID(bizreviewfilepath, target, idx)
 
         # Initialise the Chrome driver
-        driver = Utils.initialise_driver(Utils.chromedriverfilepath)
-
-        # Initialise the contribution summary file, if it has yet to exist
-        if not os.path.exists(contrisumfilepath):
-            # setting newline parameter to '' so that no unnecessary newline is created by csv writer
-            with open(contrisumfilepath, "w", newline="") as f:
-                contrisum_write = csv.writer(f)
-                contrisum_write.writerow(contrisumcols)
-
-        # Initialise the contribution details file, if it has yet to exist
-        if not os.path.exists(contridetailfilepath):
-            # setting newline parameter to '' so that no unnecessary newline is created by csv writer
-            with open(contridetailfilepath, "w", newline="") as f:
-                contridetail_write = csv.writer(f)
-                contridetail_write.writerow(contridetailcols)
+        driver = Utils.initialise_driver(chromedriverfilepath, headlessflg)
+
+        # Initialise the contribution summary and details files, if they have yet to exist
+        Utils.init_csv(contrisumfilepath, contrisumcols)
+        Utils.init_csv(contridetailfilepath, contridetailcols)
 
         # Extracting information by google contributor ID
         # Get the date of extraction
@@ -286,15 +304,26 @@ if __name__ == "__main__":
 
         print("Google Contributor scrapper program successfully run.")
 
-    except TimeoutException:
-        print(f"Error detected: {Utils.MyError('10 sec time out trying to wait for element to be visible, please troubleshoot the relevant elements')}")
+    except TimeoutException as e:
+        raise Utils.MyError('10 sec time out trying to wait for element to be visible, please troubleshoot the relevant elements') from e
 
     except NoSuchElementException as e:
-        print(f"Error detected: {Utils.MyError('Unable to locate element. See error msg for affected element(s). ' + str(e))}")
+        raise Utils.MyError('Unable to locate element. See error msg for affected element(s). ' + str(e)) from e
 
-    except (Utils.MyError, Exception, BaseException) as e:
-        print(f"Error detected: {Utils.MyError(str(e))}")
+    except Utils.MyError:
+        raise
+
+    except Exception as e:
+        raise Utils.MyError(str(e)) from e
 
     finally:
         # Close the browser regardless whether scraping is successfully completed
-        driver.quit()
+        if driver is not None:
+            driver.quit()
+
+
+if __name__ == "__main__":
+    try:
+        scrape_contributors()
+    except Utils.MyError as e:
+        print(f"Error detected: {e}")
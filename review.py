@@ -4,25 +4,20 @@ import os
 import re
 import time
 import Utils
-from dateutil.relativedelta import relativedelta
 from datetime import datetime
-from io import BytesIO
-from PIL import Image
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 #from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from selenium.webdriver.support.wait import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC 
+from selenium.webdriver.support import expected_conditions as EC
 
 # Declaring variables
 # Filepath for file containing summary information related to business entity
-bizsummaryfilepath = r'.\entitysummary.csv'
+bizsummaryfilepath = os.path.join('.', 'entitysummary.csv')
 # Filepath for file containing google reviews related to business entity
-bizreviewfilepath = r'.\entityreviews.csv'
+bizreviewfilepath = os.path.join('.', 'entityreviews.csv')
 # Filepath for folder containing review screenshot images
-imagefilepath = r'.\images'
+imagefilepath = os.path.join('.', 'images')
 # Base url for GoogleMaps
 baseurl = 'https://google.com/maps/'
 # Field names for business entity summary file
@@ -33,42 +28,121 @@ reviewcols = ['BusinessName', 'BusinessAddress', 'Reviewer_ID', 'Name',
               'Ratings', 'ContributionDate', 'ScrapedDate',
               'Reviews']
 
-if __name__ == "__main__":
+
+def search_business(driver, biz):
+    """
+    This function searches GoogleMaps for the target business entity and opens
+    the first search option returned, checking that the business name tallies
+    with the search query.
+
+    Args:
+    ----------
+    driver(object) : Selenium Chrome Webdriver
+    biz(str) : name of the target business entity
+
+    Raises
+    ------
+    MyError (str) : Inform user that the business name returned from search is incorrect
+
+    Returns
+    -------
+    name(str) : name of the business entity as shown on GoogleMaps
+
+    """
+    driver.get(baseurl)
+
+    # 1) Click on "Search Google Maps" searchbar and enter business name
+    searchbar = WebDriverWait(driver, 10).until(EC.visibility_of_element_located((By.CLASS_NAME,"xiQnY")))
+    searchbar.send_keys(biz.lower())
+
+    # 2) Select the first search option returned by Google Maps
+    option = WebDriverWait(driver, 10).until(EC.visibility_of_all_elements_located((By.CLASS_NAME,"ZHeE1b")))
+    option[0].click()
+
+    # 3a) Extract the business name and check that it tallies with the search query
+    name = WebDriverWait(driver, 10).until(EC.visibility_of_element_located((By.CLASS_NAME,"lfPIob"))).text
+    # if doesn't tally, raises error and stops scrapping to prevent scraping from wrong business entity
+    if name.lower() != biz.lower():
+        raise Utils.MyError("Name of business entity returned from search is incorrect")
+    return name
+
+
+def open_reviews(driver):
+    """
+    This function clicks on the "Reviews" button of the business entity page and
+    locates the review section.
+
+    Args:
+    ----------
+    driver(object) : Selenium Chrome Webdriver
+
+    Raises
+    ------
+    MyError (str) : Refer to the script for the error messages
+
+    Returns
+    -------
+    reviewsection(object) : Scrollable selenium element containing the reviews
+    reviewsectionparts(list) : Child selenium elements of the review section
+
+    """
+    # 5a) Click on the "Reviews" button to access the reviews page
+    tabs = driver.find_elements(By.CLASS_NAME, "Gpq6kf")
+    # Ensure that the correct button is being clicked. The Overview, Reviews and About buttons are of class "Gpq6kf"
+    if len(tabs) == 3 and tabs[1].text == 'Reviews':
+        tabs[1].click()
+    else:
+        raise Utils.MyError("Check the class names for the reviews button or review button might be missing")
+
+    # 5b) look for the main section of the review page
+    main = WebDriverWait(driver, 10).until(EC.visibility_of_element_located((By.CSS_SELECTOR, "[role= 'main']")))
+    # Then check if there is a review section within the main section. If cannot be found, raise error
+    reviewsection = main.find_elements(By.XPATH, '*')[1]
+    # Allow time for elements to load
+    time.sleep(1)
+    reviewsectionparts = reviewsection.find_elements(By.XPATH, "*")
+    if not(len(reviewsectionparts) == 10 and [ele.get_attribute('class').strip() for ele in reviewsectionparts][8] == 'm6QErb XiKgde'):
+        raise Utils.MyError("No review section detected, pleaee check")
+    return reviewsection, reviewsectionparts
+
+
+def scrape_reviews(biz, bizsummaryfilepath=bizsummaryfilepath, bizreviewfilepath=bizreviewfilepath,
+                   imagefilepath=imagefilepath, chromedriverfilepath=Utils.chromedriverfilepath,
+                   headlessflg=False, screenshotflg=True):
+    """
+    This function scrapes the summary information and google reviews of the target
+    business entity, appending them to the business summary and reviews files. It
+    then takes screenshots of the review section, if applied.
+
+    Args:
+    ----------
+    biz(str) : name of the target business entity
+    bizsummaryfilepath(str) : filepath for file containing business entity summary information
+    bizreviewfilepath(str) : filepath for file containing business entity google reviews
+    imagefilepath(str) : filepath for folder containing review screenshot images
+    chromedriverfilepath(str) : filepath pointing to the chromedriver.exe file
+    headlessflg(boolean) : whether driver is initialised in headless mode. The default is False.
+    screenshotflg(boolean) : whether to take screenshots of the reviews. The default is True.
+
+    Raises
+    ------
+    MyError (str) : Inform user of the error that stopped the scraping
+
+    Returns
+    -------
+    None
+
+    """
+    driver = None
     try:
-        # Initialise the business entity summary file, if it has yet to exist
-        if not os.path.exists(bizsummaryfilepath):
-            # setting newline parameter to '' so that no unnecessary newline is created by csv writer
-            with open(bizsummaryfilepath, 'w', newline='') as f:
-                bizsum_write = csv.writer(f)
-                bizsum_write.writerow(summarycols)
-
-        # Initialise the business entity reviews file, if it has yet to exist
-        if not os.path.exists(bizreviewfilepath):
-            # setting newline parameter to '' so that no unnecessary newline is created by csv writer
-            with open(bizreviewfilepath, 'w', newline='') as f:
-                bizreview_write = csv.writer(f)
-                bizreview_write.writerow(reviewcols)
-
-        # Get user input on the target business
-        biz = input('Please input the business name you want reviews to be scraped from : \n ')
-
-        # Initialise the Chrome driver and access the GoogleMaps url
-        driver = Utils.initialise_driver(Utils.chromedriverfilepath)
-        driver.get(baseurl)
-
-        # 1) Click on "Search Google Maps" searchbar and enter business name
-        input = WebDriverWait(driver, 10).until(EC.visibility_of_element_located((By.CLASS_NAME,"xiQnY")))
-        input.send_keys(biz.lower())
-
-        # 2) Select the first search option returned by Google Maps
-        option = WebDriverWait(driver, 10).until(EC.visibility_of_all_elements_located((By.CLASS_NAME,"ZHeE1b")))
-        option[0].click()
-
-        # 3a) Extract the business name and check that it tallies with the search query
-        name = WebDriverWait(driver, 10).until(EC.visibility_of_element_located((By.CLASS_NAME,"lfPIob"))).text
-        # if doesn't tally, raises error and stops scrapping to prevent scraping from wrong business entity
-        if name.lower() != biz.lower():
-            raise Utils.MyError("Name of business entity returned from search is incorrect")
+        # Initialise the business entity summary and reviews files, if they have yet to exist
+        Utils.init_csv(bizsummaryfilepath, summarycols)
+        Utils.init_csv(bizreviewfilepath, reviewcols)
+
+        # Initialise the Chrome driver and search for the business entity on GoogleMaps
+        driver = Utils.initialise_driver(chromedriverfilepath, headlessflg)
+        name = search_business(driver, biz)
+
         # 3b) Extract the business address
         add = [ele.text for ele in driver.find_elements(By.CLASS_NAME, 'Io6YTe')][0]
         # 3c) Extract the business category
@@ -85,25 +159,10 @@ if __name__ == "__main__":
             bizsum_append.writerow([name, add, category, avgrating, totreviews, scrapedatestr])
 
         # 5) Extracting the reviews
-        # 5a) Click on the "Reviews" button to access the reviews page
-        tabs = driver.find_elements(By.CLASS_NAME, "Gpq6kf")
-        # Ensure that the correct button is being clicked. The Overview, Reviews and About buttons are of class "Gpq6kf"
-        if len(tabs) == 3 and tabs[1].text == 'Reviews':
-            tabs[1].click()
-        else:
-            raise Utils.MyError("Check the class names for the reviews button or review button might be missing")
-        
+        reviewsection, reviewsectionparts = open_reviews(driver)
+
         with open(bizreviewfilepath, 'a', newline='', encoding='utf-8') as f1:
             bizreview_append = csv.writer(f1)
-        # 5b) look for the main section of the review page
-            main = WebDriverWait(driver, 10).until(EC.visibility_of_element_located((By.CSS_SELECTOR, "[role= 'main']")))
-            # Then check if there is a review section within the main section. If cannot be found, raise error
-            reviewsection = main.find_elements(By.XPATH, '*')[1]
-            # Allow time for elements to load
-            time.sleep(1)
-            reviewsectionparts = reviewsection.find_elements(By.XPATH, "*")
-            if not(len(reviewsectionparts) == 10 and [ele.get_attribute('class').strip() for ele in reviewsectionparts][8] == 'm6QErb XiKgde'):
-                raise Utils.MyError("No review section detected, pleaee check")
             # confirm that there are reviews in the review section
             if len(reviewsectionparts[8].find_elements(By.XPATH, "*"))>0:   # stop here
         # 5c) Scroll to bottom of reviews page so as to show all reviews and capture the max scrollheight of review section
@@ -133,21 +192,83 @@ if __name__ == "__main__":
                                               scrapedatestr,reviews[i]])
             else:
                 bizreview_append.writerow([name, add,'','','','',scrapedatestr,''])
-                
-        
-        print(f"Google Reviews for {name} successfully scraped. Waiting to take screenshots.")
-        
-        # 6) Scroll to top of the review page, then take screenshots from top to bottom, saving the screenshots
-        Utils.scroll_screenshot(element=reviewsection, driver=driver, imagefilepath=imagefilepath, stitchflg=True)
-                
+
+
+        print(f"Google Reviews for {name} successfully scraped.")
+
+        if screenshotflg:
+            print("Waiting to take screenshots.")
+            # 6) Scroll to top of the review page, then take screenshots from top to bottom, saving the screenshots
+            Utils.scroll_screenshot(element=reviewsection, driver=driver, imagefilepath=imagefilepath, stitchflg=True)
+
         print("Google Reviews scrapper program successfully run.")
-                
-    except TimeoutException:
-        print(f"Error detected: {Utils.MyError('10 sec time out trying to wait for element to be visible, please troubleshoot the relevant elements')}")
+
+    except TimeoutException as e:
+        raise Utils.MyError('10 sec time out trying to wait for element to be visible, please troubleshoot the relevant elements') from e
     except NoSuchElementException as e:
-        print(f"Error detected: {Utils.MyError('Unable to locate element. See error msg for affected element(s). ' + str(e))}")
-    except (Utils.MyError, Exception, BaseException) as e:
-        print(f"Error detected: {Utils.MyError(str(e))}")
+        raise Utils.MyError('Unable to locate element. See error msg for affected element(s). ' + str(e)) from e
+    except Utils.MyError:
+        raise
+    except Exception as e:
+        raise Utils.MyError(str(e)) from e
     finally:
         # Close the browser regardless whether scraping is successfully completed
-        driver.quit()
+        if driver is not None:
+            driver.quit()
+
+
+def screenshot_reviews(biz, imagefilepath=imagefilepath, chromedriverfilepath=Utils.chromedriverfilepath,
+                       headlessflg=False, stitchflg=True):
+    """
+    This function takes screenshots of the review section of the target business
+    entity, without scraping the reviews.
+
+    Args:
+    ----------
+    biz(str) : name of the target business entity
+    imagefilepath(str) : filepath for folder containing review screenshot images
+    chromedriverfilepath(str) : filepath pointing to the chromedriver.exe file
+    headlessflg(boolean) : whether driver is initialised in headless mode. The default is False.
+    stitchflg(boolean) : whether to stitch the images into one long image. The default is True.
+
+    Raises
+    ------
+    MyError (str) : Inform user of the error that stopped the screenshots
+
+    Returns
+    -------
+    None
+
+    """
+    driver = None
+    try:
+        driver = Utils.initialise_driver(chromedriverfilepath, headlessflg)
+        name = search_business(driver, biz)
+        reviewsection, _ = open_reviews(driver)
+        # Scroll to bottom first so that all reviews are loaded before taking screenshots
+        Utils.scroll_to_bottom(reviewsection, driver)
+        Utils.scroll_screenshot(element=reviewsection, driver=driver, imagefilepath=imagefilepath, stitchflg=stitchflg)
+
+        print(f"Screenshots of Google Reviews for {name} successfully taken.")
+
+    except TimeoutException as e:
+        raise Utils.MyError('10 sec time out trying to wait for element to be visible, please troubleshoot the relevant elements') from e
+    except NoSuchElementException as e:
+        raise Utils.MyError('Unable to locate element. See error msg for affected element(s). ' + str(e)) from e
+    except Utils.MyError:
+        raise
+    except Exception as e:
+        raise Utils.MyError(str(e)) from e
+    finally:
+        # Close the browser regardless whether screenshots are successfully taken
+        if driver is not None:
+            driver.quit()
+
+
+if __name__ == "__main__":
+    # Get user input on the target business
+    biz = input('Please input the business name you want reviews to be scraped from : \n ')
+    try:
+        scrape_reviews(biz)
+    except Utils.MyError as e:
+        print(f"Error detected: {e}")
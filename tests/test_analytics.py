@@ -0,0 +1,99 @@
+import csv
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import analytics  # noqa: E402
+import Utils  # noqa: E402
+
+detailcols = ["Reviewer_ID", "ContributionType", "BusinessName", "BusinessAddress",
+              "Ratings", "ContributionDate", "ScrapedDate", "Reviews"]
+summarycols = ["Reviewer_ID", "Name", "Localguide", "ScrapedDate"] + analytics.contricountcols
+
+
+def write_csv(filepath, fieldnames, rows=[]):
+    Utils.init_csv(str(filepath), fieldnames)
+    with open(filepath, "a", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows(rows)
+    return str(filepath)
+
+
+def review(ix, biz, rating, date, scraped="01 Mar 2024"):
+    return [[ix], "Review", biz, "", f" {rating} stars ", date, scraped, ""]
+
+
+def photo(ix, biz, scraped="01 Mar 2024"):
+    return [[ix], "Photos", biz, "", "", "", scraped, ""]
+
+
+@pytest.fixture
+def details(tmp_path):
+    rows = [review("1", "A", 5, "01 Jan 2024"), review("1", "B", 3, "03 Jan 2024"),
+            review("2", "A", 4, "02 Jan 2024"), photo("2", "C")]
+    return analytics.load_details(write_csv(tmp_path / "details.csv", detailcols, rows), cachedir=None)
+
+
+def test_header_only_files(tmp_path):
+    details = analytics.load_details(write_csv(tmp_path / "details.csv", detailcols), cachedir=None)
+    summary = analytics.load_summary(write_csv(tmp_path / "summary.csv", summarycols), cachedir=None)
+    assert len(analytics.reviewer_aggregates(details, summary, cachedir=None)) == 0
+    assert len(analytics.review_bursts(details, cachedir=None)) == 0
+    assert analytics.business_overlap(details, cachedir=None).shape == (0, 0)
+
+
+def test_no_dated_reviews(tmp_path):
+    rows = [review("1", "A", 5, ""), photo("1", "B")]
+    details = analytics.load_details(write_csv(tmp_path / "details.csv", detailcols, rows), cachedir=None)
+    df = analytics.reviewer_aggregates(details, cachedir=None)
+    assert df.loc["1", "Reviews"] == 1 and df.loc["1", "Photos"] == 1
+    assert df["FirstReview"].isna().all()
+
+
+def test_summary_alignment(tmp_path, details):
+    summary = analytics.load_summary(write_csv(tmp_path / "empty.csv", summarycols), cachedir=None)
+    df = analytics.reviewer_aggregates(details, summary, cachedir=None)
+    assert (df["Localguide"] == -1).all() and (df["SummaryReviews"] == -1).all()
+
+    rows = [[["2"], "n", "Yes", "01 Mar 2024", "1,234"] + ["3"] * 11, [["9"], "n", "No", "01 Mar 2024"] + ["7"] * 12]
+    summary = analytics.load_summary(write_csv(tmp_path / "summary.csv", summarycols, rows), cachedir=None)
+    df = analytics.reviewer_aggregates(details, summary, cachedir=None)
+    assert df.loc["1", "Localguide"] == -1 and df.loc["1", "SummaryReviews"] == -1
+    assert df.loc["2", "Localguide"] == 1 and df.loc["2", "SummaryReviews"] == 1234
+
+
+def test_rescrape_keeps_latest_rows_after_dedupe(tmp_path):
+    rows = [review("1", "A", 5, "01 Dec 2023", "01 Jan 2024"), photo("1", "B", "01 Jan 2024"),
+            review("1", "A", 5, "05 Jan 2024", "05 Feb 2024"), photo("1", "B", "05 Feb 2024")]
+    filepath = write_csv(tmp_path / "details.csv", detailcols, rows)
+    before = analytics.reviewer_aggregates(analytics.load_details(filepath, cachedir=None), cachedir=None)
+    assert Utils.dedupe_csv(filepath) == 1
+    after = analytics.reviewer_aggregates(analytics.load_details(filepath, cachedir=None), cachedir=None)
+    assert before.loc["1", "Reviews"] == after.loc["1", "Reviews"] == 1
+    assert before.loc["1", "Photos"] == after.loc["1", "Photos"] == 1
+
+
+def test_business_overlap(details, tmp_path):
+    df = analytics.business_overlap(details, businesses=["A", "B", "A"], cachedir=str(tmp_path))
+    assert df.to_numpy().tolist() == [[2, 1], [1, 1]]
+    cached = analytics.business_overlap(details, businesses=["A", "B", "A"], cachedir=str(tmp_path))
+    assert cached.to_numpy().tolist() == df.to_numpy().tolist()
+    with pytest.raises(Utils.MyError):
+        analytics.business_overlap(details, top=0, cachedir=None)
+    with pytest.raises(Utils.MyError):
+        analytics.business_overlap(details, businesses=["Z"], cachedir=None)
+
+
+def test_cache_keyed_by_source(tmp_path):
+    cachedir = str(tmp_path / "cache")
+    first = write_csv(tmp_path / "first.csv", detailcols, [review("1", "A", 5, "01 Jan 2024")])
+    second = write_csv(tmp_path / "second.csv", detailcols, [review("2", "A", 5, "01 Jan 2024")])
+    for filepath, ix in [(first, "1"), (second, "2"), (first, "1")]:
+        df = analytics.reviewer_aggregates(analytics.load_details(filepath, cachedir=cachedir), cachedir=cachedir)
+        assert df.index.tolist() == [ix]
+    assert len([name for name in os.listdir(cachedir) if name.startswith("aggregates-")]) == 2